@@ -0,0 +1,40 @@
+"""Remove duplicate revisions per user and comment
+
+Revision ID: 3c1f7b9d2e4a
+Revises: aee24b2db1c8
+Create Date: 2026-10-15 09:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '3c1f7b9d2e4a'
+down_revision = 'aee24b2db1c8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Keep only the most recent revision of each (user, comment) pair so the
+    # unique index of the next revision can be built on existing data.
+    op.execute(
+        """
+        DELETE FROM usercommentrevision AS r
+        USING usercommentrevision AS newer
+        WHERE r.user_id = newer.user_id
+          AND r.comment_id = newer.comment_id
+          AND (
+            COALESCE(r.updated_at, r.created_at, '-infinity'::timestamp),
+            r.id
+          ) < (
+            COALESCE(newer.updated_at, newer.created_at, '-infinity'::timestamp),
+            newer.id
+          )
+        """
+    )
+
+
+def downgrade():
+    # Removed duplicates cannot be restored.
+    pass
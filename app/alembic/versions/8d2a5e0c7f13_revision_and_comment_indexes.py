@@ -0,0 +1,58 @@
+"""Index revision and comment lookups
+
+Revision ID: 8d2a5e0c7f13
+Revises: 3c1f7b9d2e4a
+Create Date: 2026-10-15 10:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '8d2a5e0c7f13'
+down_revision = '3c1f7b9d2e4a'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_ucr_comment_user',
+            'usercommentrevision',
+            ['comment_id', 'user_id'],
+            unique=True,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_ucr_user',
+            'usercommentrevision',
+            ['user_id'],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            op.f('ix_comment_principle_id'),
+            'comment',
+            ['principle_id'],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            op.f('ix_comment_principle_id'),
+            table_name='comment',
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'ix_ucr_user',
+            table_name='usercommentrevision',
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'ix_ucr_comment_user',
+            table_name='usercommentrevision',
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,26 @@
+"""Default revision timestamps to now()
+
+Revision ID: b47e1d9a6c25
+Revises: 8d2a5e0c7f13
+Create Date: 2026-10-15 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b47e1d9a6c25'
+down_revision = '8d2a5e0c7f13'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.alter_column('usercommentrevision', 'updated_at', server_default=sa.text('now()'))
+    op.alter_column('usercommentrevision', 'created_at', server_default=sa.text('now()'))
+
+
+def downgrade():
+    op.alter_column('usercommentrevision', 'created_at', server_default=None)
+    op.alter_column('usercommentrevision', 'updated_at', server_default=None)
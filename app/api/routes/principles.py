@@ -1,16 +1,19 @@
+import uuid
 from datetime import datetime
 from typing import Any, Dict, List, Optional
-from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field
-from sqlalchemy import and_
+from sqlalchemy import and_, or_
 from sqlalchemy.orm import aliased
-from sqlmodel import Session, col, distinct, func, select
+from sqlmodel import col, distinct, func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.api.deps import (
-    CurrentUser,
-    SessionDep,
+    AsyncCurrentUser,
+    AsyncSessionDep,
     get_current_active_superuser,
 )
 from app.api.routes.common import DataRow
@@ -31,6 +34,18 @@ class PrinciplesSchemaResponse(BaseModel):
     principles: list[PrincipleSchema]
 
 
+# Principles change rarely, so the rendered list is cached per process and
+# invalidated by bumping the version whenever a principle is updated. The
+# per-process token keeps ETags from a previous run from matching.
+PRINCIPLES_VERSION = 0
+_PRINCIPLES_ETAG_TOKEN = uuid.uuid4().hex[:8]
+_principles_cache: dict[int, bytes] = {}
+
+
+def _principles_etag(version: int) -> str:
+    return f'W/"{_PRINCIPLES_ETAG_TOKEN}-{version}"'
+
+
 class UpdatePrincipleRequest(BaseModel):
     label_name: str | None = None
     definition: str | None = None
@@ -42,24 +57,41 @@ class UpdatePrincipleRequest(BaseModel):
     "",
     response_model=PrinciplesSchemaResponse,
 )
-async def get_principles(*, session: SessionDep, current_user: CurrentUser) -> Any:
+async def get_principles(
+    *, session: AsyncSessionDep, current_user: AsyncCurrentUser, request: Request
+) -> Any:
     """
     Fetch all principles and map them to the response schema.
     """
-    statement = select(Principle)
-    results = session.exec(statement).all()
-
-    principles_list = [
-        PrincipleSchema(
-            id=principle.id,
-            label_name=principle.name,
-            definition=principle.definition,
-            inclusion_criteria=principle.inclusion_criteria or "",
-            exclusion_criteria=principle.exclusion_criteria or "",
-        )
-        for principle in results
-    ]
-    return PrinciplesSchemaResponse(principles=principles_list)
+    version = PRINCIPLES_VERSION
+    etag = _principles_etag(version)
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"etag": etag})
+
+    content = _principles_cache.get(version)
+    if content is None:
+        statement = select(Principle)
+        results = (await session.exec(statement)).all()
+
+        # Rows come from our own table, so skip per-item and response-model
+        # validation and hand plain dicts straight to orjson.
+        principles_list = [
+            {
+                "id": principle.id,
+                "label_name": principle.name,
+                "definition": principle.definition,
+                "inclusion_criteria": principle.inclusion_criteria or "",
+                "exclusion_criteria": principle.exclusion_criteria or "",
+            }
+            for principle in results
+        ]
+        content = orjson.dumps({"principles": principles_list})
+        _principles_cache.clear()
+        _principles_cache[version] = content
+
+    return Response(
+        content=content, media_type="application/json", headers={"etag": etag}
+    )
 
 
 @router.patch(
@@ -67,8 +99,8 @@ async def get_principles(*, session: SessionDep, current_user: CurrentUser) -> A
 )  # <--- Renamed path param
 async def update_principle(
     *,
-    session: SessionDep,
-    current_user: CurrentUser,
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
     principle_id: str,
     principle_in: UpdatePrincipleRequest,
 ) -> Any:
@@ -76,7 +108,7 @@ async def update_principle(
     Update a principle.
     """
     # Use the specific ID passed in the URL
-    principle = session.get(Principle, principle_id)
+    principle = await session.get(Principle, principle_id)
 
     if not principle:
         raise HTTPException(
@@ -92,9 +124,11 @@ async def update_principle(
     if principle_in.exclusion_criteria is not None:
         principle.exclusion_criteria = principle_in.exclusion_criteria
 
-    session.add(principle)
-    session.commit()
-    session.refresh(principle)
+    await session.commit()
+    await session.refresh(principle)
+
+    global PRINCIPLES_VERSION
+    PRINCIPLES_VERSION += 1
 
     return PrincipleSchema(
         id=principle.id,
@@ -116,73 +150,133 @@ class SamplesResponse(BaseModel):
     stats: SampleStats
 
 
-from sqlalchemy import and_, or_  # Ensure these are imported from sqlalchemy
+def _revision_join_condition(current_user: User) -> Any:
+    return and_(
+        Comment.id == UserCommentRevision.comment_id,
+        UserCommentRevision.user_id == current_user.id,
+    )
+
+
+def _is_revised_condition() -> Any:
+    return and_(
+        UserCommentRevision.id.is_not(None),
+        UserCommentRevision.is_revise_completed.is_(True),
+    )
+
+
+def _effective_principle_condition(principle_id: str) -> Any:
+    return or_(
+        and_(
+            _is_revised_condition(),
+            UserCommentRevision.principle_id == principle_id,
+        ),
+        and_(
+            or_(
+                UserCommentRevision.id.is_(None),
+                UserCommentRevision.is_revise_completed.is_(False),
+            ),
+            Comment.principle_id == principle_id,
+        ),
+    )
+
+
+async def get_principle_comment_stats(
+    session: AsyncSession, principle_id: str, current_user: User
+) -> SampleStats:
+    """
+    Counts the comments effectively belonging to a principle and how many of them
+    the current user has revised, without loading the rows themselves.
+    """
+    statement = (
+        select(
+            func.count(Comment.id),
+            func.count(Comment.id).filter(_is_revised_condition()),
+        )
+        .select_from(Comment)
+        .outerjoin(UserCommentRevision, _revision_join_condition(current_user))
+        .where(_effective_principle_condition(principle_id))
+    )
+    total_count, revised_count = (await session.exec(statement)).one()
+    percentage = (revised_count / total_count * 100) if total_count > 0 else 0.0
+    return SampleStats(
+        total=total_count, revised=revised_count, percentage=round(percentage, 2)
+    )
 
 
-def get_principle_comments_with_revision_status(
-    session: Session, principle_id: str, current_user_id: UUID
-) -> list[dict]:
+async def get_principle_comments_with_revision_status(
+    session: AsyncSession,
+    principle_id: str,
+    current_user: User,
+    show_revised: bool = True,
+) -> list[dict[str, Any]]:
     """
     Fetches comments that effectively belong to a principle based on the user's revision status.
     Uses a single optimized query to handle logic for both revised and unrevised comments.
     """
-    current_user_obj = session.get(User, current_user_id)
-    reviser_name = current_user_obj.full_name if current_user_obj else ""
+    # The revision join is scoped to the current user, so every reviser is them.
+    reviser_name = current_user.full_name
 
     statement = (
-        select(Comment, UserCommentRevision)
-        .outerjoin(
-            UserCommentRevision,
-            and_(
-                Comment.id == UserCommentRevision.comment_id,
-                UserCommentRevision.user_id == current_user_id,
+        select(
+            Comment.id,
+            Comment.preceding,
+            Comment.target,
+            Comment.following,
+            Comment.A1_Score,
+            Comment.A2_Score,
+            Comment.A3_Score,
+            Comment.principle_id,
+            Comment.llm_justification,
+            Comment.llm_evidence_quote,
+            UserCommentRevision.principle_id,
+            UserCommentRevision.expert_opinion,
+            UserCommentRevision.is_revise_completed,
+            func.coalesce(
+                UserCommentRevision.updated_at, UserCommentRevision.created_at
             ),
         )
-        .where(
-            or_(
-                and_(
-                    UserCommentRevision.id.is_not(None),
-                    UserCommentRevision.is_revise_completed.is_(True),
-                    UserCommentRevision.principle_id == principle_id,
-                ),
-                and_(
-                    or_(
-                        UserCommentRevision.id.is_(None),
-                        UserCommentRevision.is_revise_completed.is_(False),
-                    ),
-                    Comment.principle_id == principle_id,
-                ),
-            )
-        )
+        .outerjoin(UserCommentRevision, _revision_join_condition(current_user))
+        .where(_effective_principle_condition(principle_id))
+        .execution_options(yield_per=500)
     )
+    if not show_revised:
+        statement = statement.where(~_is_revised_condition())
 
-    results = session.exec(statement).all()
-
+    # Rows come straight from our own tables, so emit DataRow-shaped dicts
+    # (keyed by the serialized field names) without running Pydantic on them.
     samples = []
-    for comment, revision in results:
-        is_revised = revision.is_revise_completed if revision else False
-        effective_principle_id = (
-            revision.principle_id if is_revised else comment.principle_id
-        )
-        revision_timestamp = None
-        if revision:
-            revision_timestamp = (
-                revision.updated_at if revision.updated_at else revision.created_at
-            )
-
+    async for (
+        comment_id,
+        preceding,
+        target,
+        following,
+        a1_score,
+        a2_score,
+        a3_score,
+        comment_principle_id,
+        llm_justification,
+        llm_evidence_quote,
+        revision_principle_id,
+        expert_opinion,
+        is_revise_completed,
+        revision_timestamp,
+    ) in await session.stream(statement):
+        is_revised = is_revise_completed is True
         samples.append(
             {
-                "id": comment.id,
-                "preceding": comment.preceding,
-                "target": comment.target,
-                "following": comment.following,
-                "A1_Score": comment.A1_Score,
-                "A2_Score": comment.A2_Score,
-                "A3_Score": comment.A3_Score,
-                "principle_id": effective_principle_id,
-                "llm_justification": comment.llm_justification,
-                "llm_evidence_quote": comment.llm_evidence_quote,
-                "expert_opinion": revision.expert_opinion if revision else None,
+                "id": comment_id,
+                "preceding": preceding,
+                "target": target,
+                "following": following,
+                "A1_Score": a1_score,
+                "A2_Score": a2_score,
+                "A3_Score": a3_score,
+                "principle_id": (
+                    revision_principle_id if is_revised else comment_principle_id
+                ),
+                "llm_justification": llm_justification,
+                "llm_evidence_quote": llm_evidence_quote,
+                "expert_opinion": expert_opinion,
                 "isRevised": is_revised,
                 "reviserName": reviser_name if is_revised else None,
                 "revisionTimestamp": revision_timestamp,
@@ -195,23 +289,14 @@ def get_principle_comments_with_revision_status(
 @router.get("/{principle_id}/samples", response_model=SamplesResponse)
 async def get_samples_by_principle(
     *,
-    session: SessionDep,
-    current_user: CurrentUser,
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
     principle_id: str,
     show_revised: bool = True,
 ) -> Any:
-    raw_samples = get_principle_comments_with_revision_status(
-        session, principle_id, current_user.id
+    stats = await get_principle_comment_stats(session, principle_id, current_user)
+    data_rows = await get_principle_comments_with_revision_status(
+        session, principle_id, current_user, show_revised
     )
-    total_count = len(raw_samples)
-    revised_count = sum(1 for s in raw_samples if s["isRevised"])
-    percentage = (revised_count / total_count * 100) if total_count > 0 else 0.0
-    stats = SampleStats(
-        total=total_count, revised=revised_count, percentage=round(percentage, 2)
-    )
-    if not show_revised:
-        filtered_samples = [s for s in raw_samples if not s["isRevised"]]
-    else:
-        filtered_samples = raw_samples
-    data_rows = [DataRow(**sample) for sample in filtered_samples]
-    return SamplesResponse(samples=data_rows, stats=stats)
+    # Skip response-model validation of what can be thousands of rows.
+    return ORJSONResponse({"samples": data_rows, "stats": stats.model_dump()})
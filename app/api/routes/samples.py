@@ -1,56 +1,200 @@
-from datetime import datetime, timezone
+import uuid
+from datetime import datetime
 from typing import Any, List
 
 from fastapi import APIRouter, Depends, HTTPException
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+from sqlalchemy import Row, bindparam, func, lambda_stmt, literal
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import aliased
 from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.api.deps import (
+    AsyncCurrentUser,
+    AsyncSessionDep,
+    get_current_active_superuser,
+)
 from app.api.routes.common import DataRow
 from app.models import Comment as Sample
 from app.models import User, UserCommentRevision
 
 router = APIRouter(prefix="/samples", tags=["/samples"])
-from app.api.deps import (
-    CurrentUser,
-    SessionDep,
-    get_current_active_superuser,
-)
 
 
 class SampleResponse(BaseModel):
     sample: DataRow
 
 
-@router.get("/{sample_id}", response_model=SampleResponse)
-async def get_sample(
-    *,
-    session: SessionDep,
-    current_user: CurrentUser,
-    sample_id: str,
-) -> Any:
-    """
-    Fetch a single sample by ID with revision status for the current user.
-    """
-    statement = (
+# The DataRow fields a revision write can change; the comment text is left out
+# since the client already has it.
+class SampleRevision(BaseModel):
+    id: str
+    principle_id: str
+    expert_opinion: str | None
+    is_revised: bool = Field(alias="isRevised")
+    reviser_name: str | None = Field(default=None, alias="reviserName")
+    revision_timestamp: datetime | None = Field(default=None, alias="revisionTimestamp")
+
+    class Config:
+        populate_by_name = True
+
+
+class SampleRevisionResponse(BaseModel):
+    sample: SampleRevision
+
+
+# Built once so SQLAlchemy caches the compiled SQL instead of rebuilding the
+# expression tree on every request; values are passed as bound parameters.
+_SAMPLE_WITH_REVISION_STATUS = lambda_stmt(
+    lambda: (
         select(
             Sample,
             UserCommentRevision.expert_opinion,
             UserCommentRevision.updated_at,
             UserCommentRevision.created_at,
-            User.full_name.label("reviser_name"),
+            UserCommentRevision.id.label("revision_id"),
             UserCommentRevision.is_revise_completed,
             UserCommentRevision.principle_id.label("user_principle_id"),
         )
-        .where(Sample.id == sample_id)
+        .where(Sample.id == bindparam("sample_id"))
+        .outerjoin(
+            UserCommentRevision,
+            (UserCommentRevision.comment_id == Sample.id)
+            & (UserCommentRevision.user_id == bindparam("user_id")),
+        )
+    )
+)
+
+_SAMPLE_WITH_REVISION = lambda_stmt(
+    lambda: (
+        select(Sample, UserCommentRevision)
+        .where(Sample.id == bindparam("sample_id"))
         .outerjoin(
             UserCommentRevision,
             (UserCommentRevision.comment_id == Sample.id)
-            & (UserCommentRevision.user_id == current_user.id),
+            & (UserCommentRevision.user_id == bindparam("user_id")),
+        )
+    )
+)
+
+
+async def _upsert_revision(
+    session: AsyncSession,
+    *,
+    sample_id: str,
+    user_id: uuid.UUID,
+    insert_values: dict[str, Any],
+    update_values: dict[str, Any],
+) -> Row[Any]:
+    """
+    Insert or update the user's revision row of a sample in a single statement.
+    Raises 404 when the sample does not exist and 409 when neither the sample
+    nor the user's revision has a principle.
+    """
+    values = {"id": uuid.uuid4(), "user_id": user_id, **insert_values}
+    existing = aliased(UserCommentRevision)
+    # The candidate row takes the principle of the user's existing revision
+    # (e.g. after a reassign) or else the sample's own. Postgres checks NOT NULL
+    # before ON CONFLICT, so rows without either are filtered out rather than
+    # failing; a missing sample likewise inserts nothing, so no lookup is
+    # needed before the write. Timestamps come from the column server defaults.
+    principle_id = func.coalesce(existing.principle_id, Sample.principle_id)
+    statement = (
+        insert(UserCommentRevision)
+        .from_select(
+            [*values, "comment_id", "principle_id"],
+            select(
+                *(literal(value) for value in values.values()),
+                Sample.id,
+                principle_id,
+            )
+            .outerjoin(
+                existing,
+                (existing.comment_id == Sample.id) & (existing.user_id == user_id),
+            )
+            .where(Sample.id == sample_id, principle_id.is_not(None)),
+        )
+        .on_conflict_do_update(
+            index_elements=["user_id", "comment_id"],
+            set_={**update_values, "updated_at": func.now()},
+        )
+        .returning(
+            UserCommentRevision.comment_id,
+            UserCommentRevision.principle_id,
+            UserCommentRevision.expert_opinion,
+            UserCommentRevision.is_revise_completed,
+            UserCommentRevision.updated_at,
+        )
+    )
+    revision = (await session.exec(statement)).first()
+    if revision:
+        return revision
+
+    # Nothing was written; only now pay for finding out why.
+    if not await session.get(Sample, sample_id):
+        raise HTTPException(status_code=404, detail="Sample not found")
+    raise HTTPException(status_code=409, detail="Sample is not assigned to a principle")
+
+
+def _build_data_row(
+    sample: Sample,
+    *,
+    principle_id: str,
+    expert_opinion: str | None,
+    is_revised: bool,
+    reviser_name: str | None,
+    revision_timestamp: datetime | None,
+) -> DataRow:
+    return DataRow(
+        id=sample.id,
+        preceding=sample.preceding,
+        target=sample.target,
+        following=sample.following,
+        A1_Score=sample.A1_Score,
+        A2_Score=sample.A2_Score,
+        A3_Score=sample.A3_Score,
+        principle_id=principle_id,
+        llm_justification=sample.llm_justification,
+        llm_evidence_quote=sample.llm_evidence_quote,
+        expert_opinion=expert_opinion,
+        is_revised=is_revised,
+        reviser_name=reviser_name,
+        revision_timestamp=revision_timestamp,
+    )
+
+
+def _build_revision_response(
+    revision: Row[Any], current_user: User
+) -> SampleRevisionResponse:
+    return SampleRevisionResponse(
+        sample=SampleRevision(
+            id=revision.comment_id,
+            principle_id=revision.principle_id,
+            expert_opinion=revision.expert_opinion,
+            is_revised=revision.is_revise_completed,
+            reviser_name=current_user.full_name,
+            revision_timestamp=revision.updated_at,
         )
-        .outerjoin(User, User.id == UserCommentRevision.user_id)
     )
 
-    result = session.exec(statement).first()
+
+@router.get("/{sample_id}", response_model=SampleResponse)
+async def get_sample(
+    *,
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
+    sample_id: str,
+) -> Any:
+    """
+    Fetch a single sample by ID with revision status for the current user.
+    """
+    result = (
+        await session.exec(
+            _SAMPLE_WITH_REVISION_STATUS,
+            params={"sample_id": sample_id, "user_id": current_user.id},
+        )
+    ).first()
 
     if not result:
         raise HTTPException(status_code=404, detail="Sample not found")
@@ -60,25 +204,18 @@ async def get_sample(
         expert_opinion,
         updated_at,
         created_at,
-        reviser_name,
+        revision_id,
         is_revise_completed,
         user_principle_id,
     ) = result
 
-    data_row = DataRow(
-        id=sample.id,
-        preceding=sample.preceding,
-        target=sample.target,
-        following=sample.following,
-        A1_Score=sample.A1_Score,
-        A2_Score=sample.A2_Score,
-        A3_Score=sample.A3_Score,
+    data_row = _build_data_row(
+        sample,
         principle_id=user_principle_id if user_principle_id else sample.principle_id,
-        llm_justification=sample.llm_justification,
-        llm_evidence_quote=sample.llm_evidence_quote,
         expert_opinion=expert_opinion,
         is_revised=is_revise_completed if is_revise_completed else False,
-        reviser_name=reviser_name,
+        # The revision join is scoped to the current user, so they are the reviser.
+        reviser_name=current_user.full_name if revision_id else None,
         revision_timestamp=updated_at if updated_at else created_at,
     )
 
@@ -89,73 +226,31 @@ class UpdateSampleOpinionRequest(BaseModel):
     expert_opinion: str
 
 
-@router.patch("/{sample_id}/opinion", response_model=SampleResponse)
+@router.patch("/{sample_id}/opinion", response_model=SampleRevisionResponse)
 async def update_add_opinion(
     *,
-    session: SessionDep,
-    current_user: CurrentUser,
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
     sample_id: str,
     expert_opinion_in: UpdateSampleOpinionRequest,
 ) -> Any:
     """
     Update/add expert_opinion of/to related revision row of this sample efficiently.
     """
-    statement = (
-        select(Sample, UserCommentRevision)
-        .where(Sample.id == sample_id)
-        .outerjoin(
-            UserCommentRevision,
-            (UserCommentRevision.comment_id == Sample.id)
-            & (UserCommentRevision.user_id == current_user.id),
-        )
+    revision = await _upsert_revision(
+        session,
+        sample_id=sample_id,
+        user_id=current_user.id,
+        insert_values={
+            "expert_opinion": expert_opinion_in.expert_opinion,
+            "is_revise_completed": False,
+        },
+        update_values={"expert_opinion": expert_opinion_in.expert_opinion},
     )
 
-    result = session.exec(statement).first()
+    await session.commit()
 
-    if not result:
-        raise HTTPException(status_code=404, detail="Sample not found")
-
-    sample, revision = result
-
-    now = datetime.now(timezone.utc)
-
-    if revision:
-        revision.expert_opinion = expert_opinion_in.expert_opinion
-        revision.updated_at = now
-        session.add(revision)
-    else:
-        revision = UserCommentRevision(
-            user_id=current_user.id,
-            comment_id=sample.id,
-            principle_id=sample.principle_id,
-            expert_opinion=expert_opinion_in.expert_opinion,
-            is_revise_completed=False,
-            created_at=now,
-            updated_at=now,
-        )
-        session.add(revision)
-
-    session.commit()
-    session.refresh(revision)
-
-    data_row = DataRow(
-        id=sample.id,
-        preceding=sample.preceding,
-        target=sample.target,
-        following=sample.following,
-        A1_Score=sample.A1_Score,
-        A2_Score=sample.A2_Score,
-        A3_Score=sample.A3_Score,
-        principle_id=revision.principle_id,
-        llm_justification=sample.llm_justification,
-        llm_evidence_quote=sample.llm_evidence_quote,
-        expert_opinion=revision.expert_opinion,
-        is_revised=revision.is_revise_completed,
-        reviser_name=current_user.full_name,
-        revision_timestamp=revision.updated_at or revision.created_at,
-    )
-
-    return SampleResponse(sample=data_row)
+    return _build_revision_response(revision, current_user)
 
 
 class ToggleSampleRevisionRequest(BaseModel):
@@ -163,68 +258,27 @@ class ToggleSampleRevisionRequest(BaseModel):
     reviser_name: str
 
 
-@router.patch("/{sample_id}/revision", response_model=SampleResponse)
+@router.patch("/{sample_id}/revision", response_model=SampleRevisionResponse)
 async def toggle_sample_revision(
     sample_id: str,
-    session: SessionDep,
+    session: AsyncSessionDep,
     request: ToggleSampleRevisionRequest,
-    current_user: CurrentUser,
+    current_user: AsyncCurrentUser,
 ):
-    statement = (
-        select(Sample, UserCommentRevision)
-        .where(Sample.id == sample_id)
-        .outerjoin(
-            UserCommentRevision,
-            (UserCommentRevision.comment_id == Sample.id)
-            & (UserCommentRevision.user_id == current_user.id),
-        )
+    revision = await _upsert_revision(
+        session,
+        sample_id=sample_id,
+        user_id=current_user.id,
+        insert_values={
+            "expert_opinion": "",
+            "is_revise_completed": request.is_revised,
+        },
+        update_values={"is_revise_completed": request.is_revised},
     )
 
-    result = session.exec(statement).first()
+    await session.commit()
 
-    if not result:
-        raise HTTPException(status_code=404, detail="Sample not found")
-
-    sample, revision = result
-
-    now = datetime.now(timezone.utc)
-
-    if revision:
-        revision.is_revise_completed = request.is_revised
-        revision.updated_at = now
-        session.add(revision)
-    else:
-        revision = UserCommentRevision(
-            user_id=current_user.id,
-            comment_id=sample.id,
-            principle_id=sample.principle_id,
-            expert_opinion="",
-            is_revise_completed=request.is_revised,
-            created_at=now,
-            updated_at=now,
-        )
-        session.add(revision)
-
-    session.commit()
-    session.refresh(revision)
-
-    data_row = DataRow(
-        id=sample.id,
-        preceding=sample.preceding,
-        target=sample.target,
-        following=sample.following,
-        A1_Score=sample.A1_Score,
-        A2_Score=sample.A2_Score,
-        A3_Score=sample.A3_Score,
-        principle_id=revision.principle_id,
-        llm_justification=sample.llm_justification,
-        llm_evidence_quote=sample.llm_evidence_quote,
-        expert_opinion=revision.expert_opinion,
-        is_revised=revision.is_revise_completed,
-        reviser_name=current_user.full_name,
-        revision_timestamp=revision.updated_at or revision.created_at,
-    )
-    return SampleResponse(sample=data_row)
+    return _build_revision_response(revision, current_user)
 
 
 class ToggleSampleReassignRequest(BaseModel):
@@ -235,34 +289,26 @@ class ToggleSampleReassignRequest(BaseModel):
 @router.patch("/{sample_id}/reassign", response_model=SampleResponse)
 async def toggle_sample_reassign(
     sample_id: str,
-    session: SessionDep,
+    session: AsyncSessionDep,
     request: ToggleSampleReassignRequest,
-    current_user: CurrentUser,
+    current_user: AsyncCurrentUser,
 ):
-    statement = (
-        select(Sample, UserCommentRevision)
-        .where(Sample.id == sample_id)
-        .outerjoin(
-            UserCommentRevision,
-            (UserCommentRevision.comment_id == Sample.id)
-            & (UserCommentRevision.user_id == current_user.id),
+    result = (
+        await session.exec(
+            _SAMPLE_WITH_REVISION,
+            params={"sample_id": sample_id, "user_id": current_user.id},
         )
-    )
-
-    result = session.exec(statement).first()
+    ).first()
 
     if not result:
         raise HTTPException(status_code=404, detail="Sample not found")
 
     sample, revision = result
 
-    now = datetime.now(timezone.utc)
-
     if revision:
         revision.principle_id = request.target_principle_id
         revision.is_revise_completed = True
-        revision.updated_at = now
-        session.add(revision)
+        revision.updated_at = func.now()
     else:
         revision = UserCommentRevision(
             user_id=current_user.id,
@@ -270,25 +316,15 @@ async def toggle_sample_reassign(
             principle_id=request.target_principle_id,
             expert_opinion="",
             is_revise_completed=True,
-            created_at=now,
-            updated_at=now,
         )
         session.add(revision)
 
-    session.commit()
-    session.refresh(revision)
+    await session.commit()
+    await session.refresh(revision)
 
-    data_row = DataRow(
-        id=sample.id,
-        preceding=sample.preceding,
-        target=sample.target,
-        following=sample.following,
-        A1_Score=sample.A1_Score,
-        A2_Score=sample.A2_Score,
-        A3_Score=sample.A3_Score,
+    data_row = _build_data_row(
+        sample,
         principle_id=revision.principle_id,
-        llm_justification=sample.llm_justification,
-        llm_evidence_quote=sample.llm_evidence_quote,
         expert_opinion=revision.expert_opinion,
         is_revised=revision.is_revise_completed,
         reviser_name=current_user.full_name,
@@ -1,10 +1,29 @@
+from sqlalchemy.ext.asyncio import create_async_engine
 from sqlmodel import Session, create_engine, select
 
 from app import crud
 from app.core.config import settings
 from app.models import User, UserCreate
 
-engine = create_engine(str(settings.SQLALCHEMY_DATABASE_URI))
+# Only the sync users/login routes and startup scripts use this engine, so it
+# keeps a small pool; the async engine below carries the API traffic. Together
+# they stay within 40 connections per process.
+engine = create_engine(
+    str(settings.SQLALCHEMY_DATABASE_URI),
+    pool_size=5,
+    max_overflow=5,
+    pool_pre_ping=True,
+)
+# Used by the async routes; psycopg 3 drives both engines from the same URI.
+# psycopg prepares a statement server-side once it has run prepare_threshold
+# times on a connection, so the hot per-request queries reuse their plans.
+async_engine = create_async_engine(
+    str(settings.SQLALCHEMY_DATABASE_URI),
+    pool_size=20,
+    max_overflow=10,
+    pool_pre_ping=True,
+    connect_args={"prepare_threshold": 1},
+)
 
 
 # make sure all SQLModel models are imported (app.models) before initializing DB
@@ -1,8 +1,12 @@
-import json
 import logging
+from collections.abc import Iterable, Iterator
+from itertools import islice
 from pathlib import Path
+from typing import Any
 
-from sqlmodel import Session
+import orjson
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import Session, SQLModel
 
 from app.core.db import engine
 
@@ -13,6 +17,61 @@ from app.models import Principle
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+BATCH_SIZE = 1000
+
+PRINCIPLE_COLUMNS = (
+    "id",
+    "name",
+    "definition",
+    "context_rule",
+    "inclusion_criteria",
+    "exclusion_criteria",
+)
+SAMPLE_COLUMNS = (
+    "id",
+    "preceding",
+    "target",
+    "following",
+    "A1_Score",
+    "A2_Score",
+    "A3_Score",
+    "principle_id",
+    "llm_justification",
+    "llm_evidence_quote",
+)
+
+
+def batched(
+    rows: Iterable[dict[str, Any]], size: int
+) -> Iterator[list[dict[str, Any]]]:
+    iterator = iter(rows)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def bulk_upsert(
+    session: Session,
+    model: type[SQLModel],
+    rows: Iterable[dict[str, Any]],
+    columns: tuple[str, ...],
+) -> int:
+    """
+    Insert rows or update the existing ones by id, one statement per batch.
+    """
+    statement = insert(model)
+    statement = statement.on_conflict_do_update(
+        index_elements=["id"],
+        set_={
+            column: statement.excluded[column] for column in columns if column != "id"
+        },
+    )
+    count = 0
+    for batch in batched(rows, BATCH_SIZE):
+        session.exec(statement, params=batch)
+        session.commit()
+        count += len(batch)
+    return count
+
 
 def init_principles() -> None:
     with Session(engine) as session:
@@ -25,23 +84,25 @@ def init_principles() -> None:
         logger.info(f"Loading principles from {json_file_path}")
 
         try:
-            with open(json_file_path, "r", encoding="utf-8") as f:
-                principles_data = json.load(f)
-
-            count = 0
-            for item in principles_data:
-                principle = Principle.model_validate(item)
-                session.merge(principle)
-                count += 1
-
-            session.commit()
+            with open(json_file_path, "rb") as f:
+                principles_data = orjson.loads(f.read())
+
+            count = bulk_upsert(
+                session,
+                Principle,
+                (
+                    {column: item.get(column) for column in PRINCIPLE_COLUMNS}
+                    for item in principles_data
+                ),
+                PRINCIPLE_COLUMNS,
+            )
             logger.info(f"Successfully loaded/updated {count} principles.")
 
             # Cleanup: Remove the file after successful commit
             json_file_path.unlink()
             logger.info(f"Deleted source file: {json_file_path}")
 
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             logger.error(f"Failed to decode JSON: {e}")
         except Exception as e:
             logger.error(f"An error occurred while loading principles: {e}")
@@ -59,37 +120,25 @@ def init_samples() -> None:
         logger.info(f"Loading samples from {json_file_path}")
 
         try:
-            with open(json_file_path, "r", encoding="utf-8") as f:
-                samples_data = json.load(f)
-
-            count = 0
-            for item in samples_data:
-                # Explicit mapping retained as per original code
-                samples = Samples.model_validate(
-                    {
-                        "id": item["id"],
-                        "preceding": item["preceding"],
-                        "target": item["target"],
-                        "following": item["following"],
-                        "A1_Score": item["A1_Score"],
-                        "A2_Score": item["A2_Score"],
-                        "A3_Score": item["A3_Score"],
-                        "principle_id": item["principle_id"],
-                        "llm_justification": item["llm_justification"],
-                        "llm_evidence_quote": item["llm_evidence_quote"],
-                    }
-                )
-                session.merge(samples)
-                count += 1
-
-            session.commit()
+            with open(json_file_path, "rb") as f:
+                samples_data = orjson.loads(f.read())
+
+            count = bulk_upsert(
+                session,
+                Samples,
+                (
+                    {column: item[column] for column in SAMPLE_COLUMNS}
+                    for item in samples_data
+                ),
+                SAMPLE_COLUMNS,
+            )
             logger.info(f"Successfully loaded/updated {count} samples.")
 
             # Cleanup: Remove the file after successful commit
             json_file_path.unlink()
             logger.info(f"Deleted source file: {json_file_path}")
 
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             logger.error(f"Failed to decode JSON: {e}")
         except Exception as e:
             logger.error(f"An error occurred while loading samples: {e}")
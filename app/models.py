@@ -2,6 +2,7 @@ import uuid
 from datetime import datetime
 
 from pydantic import EmailStr
+from sqlalchemy import Index, func
 from sqlmodel import Field, Relationship, SQLModel
 
 
@@ -35,14 +36,24 @@ class UpdatePassword(SQLModel):
 
 
 class UserCommentRevision(SQLModel, table=True):
+    __table_args__ = (
+        Index("ix_ucr_comment_user", "comment_id", "user_id", unique=True),
+        Index("ix_ucr_user", "user_id"),
+    )
+
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     user_id: uuid.UUID = Field(foreign_key="user.id")
     comment_id: str = Field(foreign_key="comment.id")
     principle_id: str = Field(foreign_key="principle.id")
     expert_opinion: str | None = None
     is_revise_completed: bool = False
-    updated_at: datetime | None = None
-    created_at: datetime | None = None
+    # Writers set updated_at explicitly on update; only inserts default it.
+    updated_at: datetime | None = Field(
+        default=None, sa_column_kwargs={"server_default": func.now()}
+    )
+    created_at: datetime | None = Field(
+        default=None, sa_column_kwargs={"server_default": func.now()}
+    )
 
 
 # Database model, database table inferred from class name
@@ -50,7 +61,9 @@ class User(UserBase, table=True):
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     hashed_password: str
     revised_comments: list["Comment"] = Relationship(
-        back_populates="revisers", link_model=UserCommentRevision
+        back_populates="revisers",
+        link_model=UserCommentRevision,
+        sa_relationship_kwargs={"lazy": "raise_on_sql"},
     )
 
 
@@ -80,6 +93,9 @@ class NewPassword(SQLModel):
     new_password: str = Field(min_length=8, max_length=128)
 
 
+# Relationships raise instead of lazy loading, so a per-row access that would
+# issue an extra query (N+1) fails loudly; load them explicitly when needed,
+# e.g. with selectinload().
 class Principle(SQLModel, table=True):
     id: str = Field(primary_key=True)
     name: str
@@ -87,7 +103,9 @@ class Principle(SQLModel, table=True):
     context_rule: str | None = None
     inclusion_criteria: str | None = None
     exclusion_criteria: str | None = None
-    comments: list["Comment"] = Relationship(back_populates="principle")
+    comments: list["Comment"] = Relationship(
+        back_populates="principle", sa_relationship_kwargs={"lazy": "raise_on_sql"}
+    )
 
 
 class Comment(SQLModel, table=True):
@@ -102,10 +120,14 @@ class Comment(SQLModel, table=True):
         default=None, sa_column_kwargs={"nullable": True}
     )
     llm_evidence_quote: str | None = None
-    principle_id: str | None = Field(foreign_key="principle.id")
-    principle: Principle | None = Relationship(back_populates="comments")
+    principle_id: str | None = Field(foreign_key="principle.id", index=True)
+    principle: Principle | None = Relationship(
+        back_populates="comments", sa_relationship_kwargs={"lazy": "raise_on_sql"}
+    )
     revisers: list["User"] = Relationship(
-        back_populates="revised_comments", link_model=UserCommentRevision
+        back_populates="revised_comments",
+        link_model=UserCommentRevision,
+        sa_relationship_kwargs={"lazy": "raise_on_sql"},
     )
 
 